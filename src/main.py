@@ -7,6 +7,7 @@ from datetime import datetime
 from logging import Logger
 from typing import List
 
+import matplotlib
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -136,6 +137,10 @@ def run_symbolic_regression(
 
 
 if __name__ == "__main__":
+    # Plots open in windows by default, SR_INTERACTIVE=0 saves them for batch runs
+    if os.environ.get("SR_INTERACTIVE", "1") in ("", "0"):
+        matplotlib.use("Agg")
+
     # Set random seed for reproducibility
     set_global_seed(42)
 
@@ -14,7 +14,11 @@ from symb_regression.config.settings import GeneticParams
 from symb_regression.core.tree import Node
 from symb_regression.operators.crossover import crossover
 from symb_regression.operators.definitions import BINARY_OPS, UNARY_OPS, SymbolicConfig
-from symb_regression.operators.mutation import create_random_tree, mutate
+from symb_regression.operators.mutation import (
+    WeightedSampler,
+    create_random_tree,
+    mutate,
+)
 from symb_regression.utils.metrics import Metrics
 
 logger: Logger = logging.getLogger("symb_regression")
@@ -36,6 +40,10 @@ class GeneticProgram:
         self.metrics_history: List[Metrics] = []
         self.config: SymbolicConfig = config
 
+        # Operator samplers are built once and shared by every tree operation
+        self.unary_sampler: WeightedSampler = WeightedSampler.uniform(UNARY_OPS)
+        self.binary_sampler: WeightedSampler = WeightedSampler.uniform(BINARY_OPS)
+
     def calculate_population_diversity(self) -> float:
         """Calculate population diversity using expression structure."""
         unique_structures = set()
@@ -80,21 +88,21 @@ class GeneticProgram:
 
     def create_random_tree(self, depth: int) -> Node:
         return create_random_tree(
-            depth, self.params.maximum_tree_depth, self.config.n_variables
+            depth,
+            self.params.maximum_tree_depth,
+            self.config.n_variables,
+            self.unary_sampler,
+            self.binary_sampler,
         )
 
     def mutate(self, node: Node) -> Node:
-        # Create default weights if no history yet
-        unary_weights = {op: 1.0 / len(UNARY_OPS) for op in UNARY_OPS}
-        binary_weights = {op: 1.0 / len(BINARY_OPS) for op in BINARY_OPS}
-
         return mutate(
             node=node,
             mutation_prob=self.params.mutation_prob,
             max_depth=self.params.maximum_tree_depth,
             n_variables=self.config.n_variables,
-            unary_weights=unary_weights,
-            binary_weights=binary_weights,
+            unary_sampler=self.unary_sampler,
+            binary_sampler=self.binary_sampler,
         )
 
     def calculate_fitness(
@@ -1,5 +1,8 @@
 import random
-from typing import Dict, Optional
+from bisect import bisect
+from collections import deque
+from itertools import accumulate
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 
@@ -12,226 +15,248 @@ from symb_regression.operators.definitions import (
 )
 
 
+class WeightedSampler:
+    """Draw keys by weight using cumulative weights computed once up front."""
+
+    def __init__(self, weights: Dict[str, float]) -> None:
+        self.keys: Tuple[str, ...] = tuple(weights.keys())
+        self.cum: List[float] = list(accumulate(weights.values()))
+        self.total: float = self.cum[-1]
+
+    def sample(self, rnd: Callable[[], float] = random.random) -> str:
+        # Same draw as random.choices(keys, weights)[0], without rebuilding lists
+        return self.keys[bisect(self.cum, rnd() * self.total, 0, len(self.cum) - 1)]
+
+    @classmethod
+    def uniform(cls, keys: Dict[str, Callable]) -> "WeightedSampler":
+        return cls({key: 1.0 / len(keys) for key in keys})
+
+
+class _MutationContext(NamedTuple):
+    """Values bound once per mutate call and shared by every handler call."""
+
+    max_depth: int
+    n_variables: int
+    unary_sampler: WeightedSampler
+    binary_sampler: WeightedSampler
+    rnd: Callable[[], float]
+    randint: Callable[[int, int], int]
+    gauss: Callable[[float, float], float]
+    subtree_depth_range: Tuple[int, int]
+    step_factor: float
+
+
+# Mutation handlers return a replacement node, if any
+MutationHandler = Callable[[Node, _MutationContext], Optional[Node]]
+
+
+def _mutate_subtree(node: Node, ctx: _MutationContext) -> Optional[Node]:
+    """Replace the node with a freshly grown random subtree."""
+    return create_random_tree(
+        ctx.randint(*ctx.subtree_depth_range),
+        ctx.max_depth,
+        ctx.n_variables,
+        ctx.unary_sampler,
+        ctx.binary_sampler,
+    )
+
+
+def _mutate_operator(node: Node, ctx: _MutationContext) -> Optional[Node]:
+    """Swap the operator for another one of the same arity."""
+    if node.op in UNARY_OPS:
+        node.op = ctx.unary_sampler.sample(ctx.rnd)
+    elif node.op in BINARY_OPS:
+        node.op = ctx.binary_sampler.sample(ctx.rnd)
+    return None
+
+
+def _mutate_constant(node: Node, ctx: _MutationContext) -> Optional[Node]:
+    """Perturb a constant with gaussian noise scaled to its magnitude."""
+    if node.value is not None:
+        step = abs(node.value) * ctx.step_factor if node.value != 0 else ctx.step_factor
+        node.value += ctx.gauss(0, step)
+    return None
+
+
+def _mutate_simplify(node: Node, ctx: _MutationContext) -> Optional[Node]:
+    """Apply algebraic identity rules, returning the replacement node if any."""
+    if node.op == "*":  # Multiplication identities
+        if (node.left and node.left.value == 0) or (
+            node.right and node.right.value == 0
+        ):
+            return Node(value=0)  # x * 0 = 0
+        if node.left and node.left.value == 1:
+            return node.right.copy() if node.right else node  # 1 * x = x
+        if node.right and node.right.value == 1:
+            return node.left.copy() if node.left else node  # x * 1 = x
+
+    elif node.op == "+":  # Addition identities
+        if node.left and node.left.value == 0:
+            return node.right.copy() if node.right else node  # 0 + x = x
+        if node.right and node.right.value == 0:
+            return node.left.copy() if node.left else node  # x + 0 = x
+
+    elif node.op == "-":  # Subtraction identities
+        if node.right and node.right.value == 0:
+            return node.left.copy() if node.left else node  # x - 0 = x
+        if node.left and node.right and node.left.value == node.right.value:
+            return Node(value=0)  # x - x = 0
+
+    elif node.op == "/":  # Division identities
+        if node.left and node.left.value == 0:
+            return Node(value=0)  # 0 / x = 0
+        if node.right and node.right.value == 1:
+            return node.left.copy() if node.left else node  # x / 1 = x
+        if node.left and node.right and node.left.value == node.right.value:
+            return Node(value=1)  # x / x = 1 (when x ≠ 0)
+
+    elif node.op == "**":  # Power identities
+        if node.right and node.right.value == 0:
+            return Node(value=1)  # x ^ 0 = 1
+        if node.right and node.right.value == 1:
+            return node.left.copy() if node.left else node  # x ^ 1 = x
+        if node.left and node.left.value == 1:
+            return Node(value=1)  # 1 ^ x = 1
+        if node.left and node.left.value == 0:
+            return Node(value=0)  # 0 ^ x = 0 (when x > 0)
+
+    return None
+
+
+_DISPATCH: Dict[MutationType, MutationHandler] = {
+    MutationType.SUBTREE: _mutate_subtree,
+    MutationType.OPERATOR: _mutate_operator,
+    MutationType.CONSTANT: _mutate_constant,
+    MutationType.SIMPLIFY: _mutate_simplify,
+}
+
+
 def mutate(
     node: Node,
     mutation_prob: float,
     max_depth: int,
     n_variables: int,
-    unary_weights: Dict[str, float],
-    binary_weights: Dict[str, float],
+    unary_sampler: WeightedSampler,
+    binary_sampler: WeightedSampler,
     config: MutationConfig = MutationConfig(),
 ) -> Node:
-    if random.random() > mutation_prob:
-        return node
+    # Bind hot lookups to locals once instead of once per visited node
+    rnd = random.random
+    choices = random.choices
+    mutation_types = list(config.MUTATION_WEIGHTS.keys())
+    mutation_weights = list(config.MUTATION_WEIGHTS.values())
+    decay = config.MUTATION_DECAY
+    ctx = _MutationContext(
+        max_depth=max_depth,
+        n_variables=n_variables,
+        unary_sampler=unary_sampler,
+        binary_sampler=binary_sampler,
+        rnd=rnd,
+        randint=random.randint,
+        gauss=random.gauss,
+        subtree_depth_range=config.SUBTREE_DEPTH_RANGE,
+        step_factor=config.VALUE_STEP_FACTOR,
+    )
+
+    root = node
+    # Explicit stack of (node, mutation probability, parent, is left child)
+    stack: Deque[Tuple[Node, float, Optional[Node], bool]] = deque(
+        [(node, mutation_prob, None, True)]
+    )
+    while stack:
+        current, prob, parent, is_left = stack.pop()
+        if rnd() > prob:
+            continue
+
+        # Mutate this node
+        mutation_type: MutationType = choices(mutation_types, mutation_weights)[0]
+        handler = _DISPATCH.get(mutation_type)
+        replacement = handler(current, ctx) if handler else None
+
+        if replacement is not None:
+            # A replaced subtree is not mutated any further
+            if parent is None:
+                return replacement
+            if is_left:
+                parent.left = replacement
+            else:
+                parent.right = replacement
+            continue
 
-    # Mutate this node
-    mutation_type: MutationType = random.choices(
-        list(config.MUTATION_WEIGHTS.keys()),
-        weights=list(config.MUTATION_WEIGHTS.values()),
-    )[0]
-
-    if mutation_type == MutationType.SUBTREE:
-        return create_random_tree(
-            random.randint(*config.SUBTREE_DEPTH_RANGE),
-            max_depth,
-            n_variables,
-            unary_weights,
-            binary_weights,
-        )
-
-    elif mutation_type == MutationType.OPERATOR:
-        if node.op in UNARY_OPS:
-            node.op = random.choices(
-                list(unary_weights.keys()),
-                weights=list(unary_weights.values()),
-            )[0]
-        elif node.op in BINARY_OPS:
-            node.op = random.choices(
-                list(binary_weights.keys()),
-                weights=list(binary_weights.values()),
-            )[0]
-
-    elif mutation_type == MutationType.OPERATOR:
-        if node.value is not None:
-            step = (
-                abs(node.value) * config.VALUE_STEP_FACTOR
-                if node.value != 0
-                else config.VALUE_STEP_FACTOR
-            )
-            node.value += random.gauss(0, step)
-
-    elif mutation_type == MutationType.SIMPLIFY:
-        # Identity rules
-        if node.op == "*":  # Multiplication identities
-            if (node.left and node.left.value == 0) or (
-                node.right and node.right.value == 0
-            ):
-                return Node(value=0)  # x * 0 = 0
-            if node.left and node.left.value == 1:
-                return node.right.copy() if node.right else node  # 1 * x = x
-            if node.right and node.right.value == 1:
-                return node.left.copy() if node.left else node  # x * 1 = x
-
-        elif node.op == "+":  # Addition identities
-            if node.left and node.left.value == 0:
-                return node.right.copy() if node.right else node  # 0 + x = x
-            if node.right and node.right.value == 0:
-                return node.left.copy() if node.left else node  # x + 0 = x
-
-        elif node.op == "-":  # Subtraction identities
-            if node.right and node.right.value == 0:
-                return node.left.copy() if node.left else node  # x - 0 = x
-            if node.left and node.right and node.left.value == node.right.value:
-                return Node(value=0)  # x - x = 0
-
-        elif node.op == "/":  # Division identities
-            if node.left and node.left.value == 0:
-                return Node(value=0)  # 0 / x = 0
-            if node.right and node.right.value == 1:
-                return node.left.copy() if node.left else node  # x / 1 = x
-            if node.left and node.right and node.left.value == node.right.value:
-                return Node(value=1)  # x / x = 1 (when x ≠ 0)
-
-        elif node.op == "**":  # Power identities
-            if node.right and node.right.value == 0:
-                return Node(value=1)  # x ^ 0 = 1
-            if node.right and node.right.value == 1:
-                return node.left.copy() if node.left else node  # x ^ 1 = x
-            if node.left and node.left.value == 1:
-                return Node(value=1)  # 1 ^ x = 1
-            if node.left and node.left.value == 0:
-                return Node(value=0)  # 0 ^ x = 0 (when x > 0)
-
-    # Recursively mutate children with reduced probability
-    if node.left:
-        node.left = mutate(
-            node.left,
-            mutation_prob * config.MUTATION_DECAY,
-            max_depth,
-            n_variables,
-            unary_weights,
-            binary_weights,
-            config=config,
-        )
-    if node.right:
-        node.right = mutate(
-            node.right,
-            mutation_prob * config.MUTATION_DECAY,
-            max_depth,
-            n_variables,
-            unary_weights,
-            binary_weights,
-            config=config,
-        )
-
-    return node
+        # Visit children with reduced probability, left first
+        child_prob = prob * decay
+        if current.right is not None:
+            stack.append((current.right, child_prob, current, False))
+        if current.left is not None:
+            stack.append((current.left, child_prob, current, True))
+
+    return root
 
 
 def create_random_tree(
     depth: int,
     max_depth: int,
     n_variables: int,
-    unary_weights: Optional[Dict[str, float]] = None,
-    binary_weights: Optional[Dict[str, float]] = None,
+    unary_sampler: Optional[WeightedSampler] = None,
+    binary_sampler: Optional[WeightedSampler] = None,
     config: TreeConfig = TreeConfig(),
 ) -> Node:
-    # Use default weights if none provided
-    if unary_weights is None:
-        unary_weights = {op: 1.0 / len(UNARY_OPS) for op in UNARY_OPS}
-    if binary_weights is None:
-        binary_weights = {op: 1.0 / len(BINARY_OPS) for op in BINARY_OPS}
+    # Use uniform weights if none provided
+    if unary_sampler is None:
+        unary_sampler = WeightedSampler.uniform(UNARY_OPS)
+    if binary_sampler is None:
+        binary_sampler = WeightedSampler.uniform(BINARY_OPS)
+
+    # Bind config values and random functions once for the whole recursion
+    rnd = random.random
+    randint = random.randint
+    uniform = random.uniform
+    sample_unary = unary_sampler.sample
+    sample_binary = binary_sampler.sample
+    var_p = config.VARIABLE_PROBABILITY
+    op_p = config.OPERATOR_PROBABILITY
+    unary_p = config.UNARY_OPERATOR_PROBABILITY
+    const_lo, const_hi = config.CONSTANT_RANGE
+
+    def grow(depth: int) -> Node:
+        # At maximum depth, prefer variables over constants
+        if depth >= max_depth:
+            if rnd() < var_p:
+                var_idx = randint(1, n_variables)
+                return Node(variable_idx=randint(0, n_variables - 1))
+            else:
+                return Node(value=uniform(const_lo, const_hi))
+
+        # For intermediate depths
+        if rnd() < op_p:
+            if rnd() < unary_p:
+                node = Node(op=sample_unary())
+                node.left = grow(depth + 1)
+            else:
+                node = Node(op=sample_binary())
+                node.left = grow(depth + 1)
+                node.right = grow(depth + 1)
+            return node
+        else:
+            if rnd() < var_p:
+                var_idx = randint(1, n_variables)
+                return Node(variable_idx=var_idx)
+            else:
+                return Node(value=uniform(const_lo, const_hi))
 
     # Force at least one variable in the expression at root level
     if depth == 0:
         # Binary operator with at least one variable
-        op = random.choices(
-            list(binary_weights.keys()),
-            weights=list(binary_weights.values()),
-            k=1,
-        )[0]
-        node = Node(op=op)
+        node = Node(op=sample_binary())
 
         # Force one child to be a variable
-        var_idx: int = random.randint(0, n_variables)
-        if random.random() < config.ROOT_VARIABLE_SIDE_PROBABILITY:
+        var_idx: int = randint(0, n_variables)
+        if rnd() < config.ROOT_VARIABLE_SIDE_PROBABILITY:
             node.left = Node(variable_idx=var_idx)
-            node.right = create_random_tree(
-                depth + 1,
-                max_depth,
-                n_variables,
-                unary_weights,
-                binary_weights,
-                config=config,
-            )
+            node.right = grow(depth + 1)
         else:
-            node.left = create_random_tree(
-                depth + 1,
-                max_depth,
-                n_variables,
-                unary_weights,
-                binary_weights,
-                config=config,
-            )
+            node.left = grow(depth + 1)
             node.right = Node(variable_idx=var_idx)
         return node
 
-    # At maximum depth, prefer variables over constants
-    if depth >= max_depth:
-        if random.random() < config.VARIABLE_PROBABILITY:
-            var_idx = random.randint(1, n_variables)
-            return Node(variable_idx=random.randint(0, n_variables - 1))
-        else:
-            return Node(value=random.uniform(*config.CONSTANT_RANGE))
-
-    # For intermediate depths
-    if random.random() < config.OPERATOR_PROBABILITY:
-        if random.random() < config.UNARY_OPERATOR_PROBABILITY:
-            op = random.choices(
-                list(unary_weights.keys()),
-                weights=list(unary_weights.values()),
-                k=1,
-            )[0]
-            node = Node(op=op)
-            node.left = create_random_tree(
-                depth + 1,
-                max_depth,
-                n_variables,
-                unary_weights,
-                binary_weights,
-                config=config,
-            )
-        else:
-            op = random.choices(
-                list(binary_weights.keys()),
-                weights=list(binary_weights.values()),
-                k=1,
-            )[0]
-            node = Node(op=op)
-            node.left = create_random_tree(
-                depth + 1,
-                max_depth,
-                n_variables,
-                unary_weights,
-                binary_weights,
-                config=config,
-            )
-            node.right = create_random_tree(
-                depth + 1,
-                max_depth,
-                n_variables,
-                unary_weights,
-                binary_weights,
-                config=config,
-            )
-        return node
-    else:
-        if random.random() < config.VARIABLE_PROBABILITY:
-            var_idx = random.randint(1, n_variables)
-            return Node(variable_idx=var_idx)
-        else:
-            return Node(
-                value=random.uniform(
-                    config.CONSTANT_RANGE[0],
-                    config.CONSTANT_RANGE[1],
-                )
-            )
+    return grow(depth)
@@ -1,9 +1,16 @@
+import hashlib
 import os
-from typing import Tuple
+import tempfile
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 import numpy as np
 import numpy.typing as npt
 
+# Seeded split permutations, keyed by (n_samples, seed), least recently used first
+_PERMUTATION_CACHE: OrderedDict[Tuple[int, int], npt.NDArray[np.long]] = OrderedDict()
+PERMUTATION_CACHE_SIZE = 8
+
 
 def print_stats(x: npt.NDArray[np.float64], y: npt.NDArray[np.float64]) -> None:
     print("=" * 50)
@@ -13,12 +20,25 @@ def print_stats(x: npt.NDArray[np.float64], y: npt.NDArray[np.float64]) -> None:
 
     # Print statistics for each variable
     if x.ndim > 1:
-        for i in range(x.shape[1]):
+        # Reduce every column at once, then print per variable
+        mins = x.min(axis=0)
+        maxs = x.max(axis=0)
+        means = x.mean(axis=0)
+        stds = x.std(axis=0)
+        # Pearson correlation: centered dot products over the centered norms
+        x_centered = x - means
+        y_centered = y - y.mean()
+        corrs = x_centered.T @ y_centered / (
+            np.linalg.norm(x_centered, axis=0) * np.linalg.norm(y_centered)
+        )
+
+        for i, (x_min, x_max, mean, std, corr) in enumerate(
+            zip(mins, maxs, means, stds, corrs)
+        ):
             print(f"\nVariable x{i}:")
-            print(f"  Range: [{x[:,i].min():g}, {x[:,i].max():g}]")
-            print(f"  Mean: {x[:,i].mean():g}")
-            print(f"  Std: {x[:,i].std():g}")
-            corr = np.corrcoef(x[:, i], y)[0, 1]
+            print(f"  Range: [{x_min:g}, {x_max:g}]")
+            print(f"  Mean: {mean:g}")
+            print(f"  Std: {std:g}")
             print(f"  Correlation with y: {corr:g}")
 
     print("\nTarget y:")
@@ -28,6 +48,50 @@ def print_stats(x: npt.NDArray[np.float64], y: npt.NDArray[np.float64]) -> None:
     print("=" * 50)
 
 
+def save_array_atomic(path: str, array: npt.NDArray) -> None:
+    """Write array as .npy to a temp file, then move it into place in one step."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_arrays(
+    file_path: str, problem_name: str
+) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    Read x and y from a .npz file.
+
+    When SR_DATA_CACHE is set, the arrays are unpacked once into .npy files in
+    that directory and memory-mapped read-only on every later load. Cache files
+    are keyed by the absolute path of the source, so problems with the same
+    name in different data directories never share a cache entry.
+    """
+    cache_dir = os.environ.get("SR_DATA_CACHE")
+    if not cache_dir:
+        data = np.load(file_path)
+        return data["x"], data["y"]
+
+    source_key = hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()[:16]
+    cache_x = os.path.join(cache_dir, f"{problem_name}_{source_key}_x.npy")
+    cache_y = os.path.join(cache_dir, f"{problem_name}_{source_key}_y.npy")
+    source_mtime = os.path.getmtime(file_path)
+    if not all(
+        os.path.exists(path) and os.path.getmtime(path) >= source_mtime
+        for path in (cache_x, cache_y)
+    ):
+        os.makedirs(cache_dir, exist_ok=True)
+        with np.load(file_path) as data:
+            save_array_atomic(cache_x, data["x"])
+            save_array_atomic(cache_y, data["y"])
+
+    return np.load(cache_x, mmap_mode="r"), np.load(cache_y, mmap_mode="r")
+
+
 def load_data(
     data_dir: str, problem_name: str, show_stats: bool = False
 ) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
@@ -37,9 +101,8 @@ def load_data(
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Data file not found: {file_path}")
 
-        data = np.load(file_path)
-        x = data["x"]  # Shape (n_variables, n_samples)
-        y = data["y"]  # Shape (n_samples,)
+        # x has shape (n_variables, n_samples), y has shape (n_samples,)
+        x, y = load_arrays(file_path, problem_name)
 
         # Transpose x to shape (n_samples, n_variables)
         if x.ndim == 2 and x.shape[0] < x.shape[1]:
@@ -58,6 +121,8 @@ def split_data(
     x: npt.NDArray[np.float64],
     y: npt.NDArray[np.float64],
     train_size: float = 0.8,
+    seed: Optional[int] = None,
+    perm: Optional[npt.NDArray[np.long]] = None,
 ) -> Tuple[
     npt.NDArray[np.float64],
     npt.NDArray[np.float64],
@@ -71,6 +136,10 @@ def split_data(
         x: Input features array
         y: Target values array
         train_ratio: Ratio of data to use for training (default: 0.8)
+        seed: If given, the shuffle is drawn from this seed once and reused on
+            later calls with the same seed and number of samples (only the
+            PERMUTATION_CACHE_SIZE most recently used shuffles are kept)
+        perm: Explicit permutation of the sample indices, overrides seed
 
     Returns:
         Tuple containing (x_train, x_val, y_train, y_val)
@@ -98,17 +167,41 @@ def split_data(
             f"x and y must have same number of samples. Got x: {x.shape[0]}, y: {y.shape[0]}"
         )
 
-    # Create random permutation using numpy
-    idx: npt.NDArray[np.long] = np.random.permutation(n_samples)
+    # Pick the shuffle: explicit, cached per seed, or from the global numpy RNG
+    idx: npt.NDArray[np.long]
+    if perm is not None:
+        if perm.shape != (n_samples,):
+            raise ValueError(f"perm must have shape ({n_samples},), got {perm.shape}")
+        if not np.issubdtype(perm.dtype, np.integer):
+            raise ValueError(f"perm must have an integer dtype, got {perm.dtype}")
+        if n_samples and (perm.min() < 0 or perm.max() >= n_samples):
+            raise ValueError(f"perm indices must lie in range({n_samples})")
+        if not (np.bincount(perm, minlength=n_samples) == 1).all():
+            raise ValueError(f"perm must be a permutation of range({n_samples})")
+        idx = perm
+    elif seed is not None:
+        key = (n_samples, seed)
+        if key in _PERMUTATION_CACHE:
+            _PERMUTATION_CACHE.move_to_end(key)
+        else:
+            cached = np.random.default_rng(seed).permutation(n_samples)
+            cached.setflags(write=False)
+            _PERMUTATION_CACHE[key] = cached
+            if len(_PERMUTATION_CACHE) > PERMUTATION_CACHE_SIZE:
+                _PERMUTATION_CACHE.popitem(last=False)
+        idx = _PERMUTATION_CACHE[key]
+    else:
+        idx = np.random.permutation(n_samples)
     train_size_int = int(n_samples * train_size)
 
-    mask: npt.NDArray = np.zeros(n_samples, dtype=bool)
-    mask[idx[:train_size_int]] = True
+    x_shuffled: npt.NDArray[np.float64] = x[idx]
+    y_shuffled: npt.NDArray[np.float64] = y[idx]
 
-    x_train: npt.NDArray[np.float64] = x[mask]
-    y_train: npt.NDArray[np.float64] = y[mask]
-    x_val: npt.NDArray[np.float64] = x[~mask]
-    y_val: npt.NDArray[np.float64] = y[~mask]
+    # Contiguous slices of the shuffled copies are views, not new arrays
+    x_train: npt.NDArray[np.float64] = x_shuffled[:train_size_int]
+    y_train: npt.NDArray[np.float64] = y_shuffled[:train_size_int]
+    x_val: npt.NDArray[np.float64] = x_shuffled[train_size_int:]
+    y_val: npt.NDArray[np.float64] = y_shuffled[train_size_int:]
 
     return x_train, x_val, y_train, y_val
 
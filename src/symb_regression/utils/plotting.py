@@ -1,38 +1,82 @@
+import logging
+import os
+from logging import Logger
 from typing import Any, List, Optional, Tuple
 
+import matplotlib
 import matplotlib.pyplot as plt
-import networkx as nx
 import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
 
 from symb_regression.core.tree import Node
 from symb_regression.operators.definitions import SymbolicConfig
 from symb_regression.utils.metrics import Metrics
 
+logger: Logger = logging.getLogger("symb_regression")
+
+_METRIC_DTYPE = np.dtype(
+    [("gen", "i4"), ("best", "f8"), ("avg", "f8"), ("worst", "f8")]
+)
+
+# Where figures are written when the active backend cannot display them
+PLOT_DIR = os.environ.get("SR_PLOT_DIR", os.path.join("results", "plots"))
+# Vector formats (pdf, svg) keep axes and text sharp around rasterized artists
+PLOT_FORMAT = os.environ.get("SR_PLOT_FORMAT", "png").lstrip(".").lower()
+SAVE_DPI = 150
+NON_INTERACTIVE_BACKENDS = {"agg", "cairo", "pdf", "pgf", "ps", "svg", "template"}
+
+# Above this many samples the prediction plot is drawn as a binned density image
+DENSITY_THRESHOLD = 50_000
+DENSITY_BINS = 600
+
+
+def show_or_save(fig: Figure, name: str) -> None:
+    """
+    Show the figure, or save it to PLOT_DIR as PLOT_FORMAT and close it when
+    the active backend is non-interactive. The backend itself is left to the
+    caller.
+    """
+    if matplotlib.get_backend().lower() not in NON_INTERACTIVE_BACKENDS:
+        plt.show()
+        return
+
+    os.makedirs(PLOT_DIR, exist_ok=True)
+    file_path = os.path.abspath(os.path.join(PLOT_DIR, f"{name}.{PLOT_FORMAT}"))
+    fig.savefig(file_path, dpi=SAVE_DPI)
+    plt.close(fig)
+    logger.info(f"Plot saved to: {file_path}")
+
 
 def plot(x: np.ndarray, y: np.ndarray, best_solution: Node, history: List[Metrics]):
-    _, axs = plt.subplots(1, 2, figsize=(12, 6))
+    fig, axs = plt.subplots(1, 2, figsize=(12, 6))
     plot_evolution_metrics(history, ax=axs[0])
     plot_prediction_analysis(best_solution, x, y, ax=axs[1])
     plt.tight_layout()
-    plt.show()
+    show_or_save(fig, "evolution")
     plot_expression_tree(best_solution)
 
 
 def plot_evolution_metrics(metrics_history: List[Any], ax=None) -> None:
     """Plot metrics related to the evolution process."""
-    generations = [m.generation for m in metrics_history]
-    best_fitness = [m.best_fitness for m in metrics_history]
-    best_gen = generations[np.argmax(best_fitness)]
+    # Single pass over the history into contiguous per-field columns
+    history = np.fromiter(
+        (
+            (m.generation, m.best_fitness, m.avg_fitness, m.worst_fitness)
+            for m in metrics_history
+        ),
+        dtype=_METRIC_DTYPE,
+        count=len(metrics_history),
+    )
+    best_gen = history["gen"][history["best"].argmax()]
 
     if ax is None:
         ax = plt.gca()
 
-    avg_fitness = [m.avg_fitness for m in metrics_history]
-    worst_fitness = [m.worst_fitness for m in metrics_history]
-
-    ax.plot(generations, best_fitness, "g-", label="Best", linewidth=2)
-    ax.plot(generations, avg_fitness, "b-", label="Average", alpha=0.7)
-    ax.plot(generations, worst_fitness, "r-", label="Worst", alpha=0.5)
+    ax.plot(history["gen"], history["best"], "g-", label="Best", linewidth=2)
+    ax.plot(history["gen"], history["avg"], "b-", label="Average", alpha=0.7)
+    ax.plot(history["gen"], history["worst"], "r-", label="Worst", alpha=0.5)
     ax.axvline(x=best_gen, color="green", linestyle="--", alpha=0.5)
 
     ax.set_xlabel("Generation")
@@ -65,22 +109,48 @@ def plot_prediction_analysis(
     # Calculate predictions
     y_pred = expression.evaluate(x, config)
 
-    # Calculate metrics
-    mse = np.mean((y - y_pred) ** 2).astype(np.float64)
-    r2 = 1 - (np.sum((y - y_pred) ** 2) / np.sum((y - np.mean(y)) ** 2)).astype(
-        np.float64
-    )
+    # Calculate metrics, sharing the residual sum of squares between them
+    residuals = y - y_pred
+    ss_res = residuals @ residuals
+    mse = ss_res / residuals.size
+    y_centered = y - y.mean()
+    r2 = 1.0 - ss_res / (y_centered @ y_centered)
 
     # Create figure
     if ax is None:
         ax = plt.gca()
 
+    # Shared axis range from one reduction per array and bound
+    min_val = np.minimum(y.min(), y_pred.min())
+    max_val = np.maximum(y.max(), y_pred.max())
+
     # Plot predicted vs actual
-    ax.scatter(y, y_pred, alpha=0.5, label="Predictions")
+    if (
+        y.size > DENSITY_THRESHOLD
+        and np.isfinite((min_val, max_val)).all()
+        and max_val > min_val
+    ):
+        # Too many points for a scatter: bin them and draw a single density image
+        counts, _, _ = np.histogram2d(
+            y,
+            y_pred,
+            bins=DENSITY_BINS,
+            range=((min_val, max_val), (min_val, max_val)),
+        )
+        ax.imshow(
+            np.ma.masked_equal(counts.T, 0),
+            extent=(min_val, max_val, min_val, max_val),
+            origin="lower",
+            aspect="auto",
+            cmap="Blues",
+            norm=LogNorm(),
+        )
+    else:
+        # Rasterized so dense clouds stay cheap in vector output
+        scatter = ax.scatter(y, y_pred, alpha=0.5, label="Predictions")
+        scatter.set_rasterized(True)
 
     # Plot perfect prediction line
-    min_val = np.min((np.min(y), np.min(y_pred)))
-    max_val = np.max((np.max(y), np.max(y_pred)))
     ax.plot(
         [min_val, max_val],
         [min_val, max_val],
@@ -107,89 +177,59 @@ def plot_prediction_analysis(
     return mse, r2
 
 
-def plot_expression_tree(root_node):
-    import matplotlib.pyplot as plt
-
-    G = nx.DiGraph()
-    nodes_list = []
-
-    def collect_nodes(node, parent_id=None):
-        current_id = id(node)
-        nodes_list.append(node)
-
-        if parent_id is not None:
-            G.add_edge(parent_id, current_id)
-
-        if node.left:
-            collect_nodes(node.left, current_id)
-        if node.right:
-            collect_nodes(node.right, current_id)
+def plot_expression_tree(root_node: Node) -> None:
+    ax = plt.gca()
 
-    collect_nodes(root_node)
+    labels: List[str] = []
+    xs: List[float] = []
+    ys: List[float] = []
+    segments: List[List[Tuple[float, float]]] = []
 
-    def hierarchical_layout(
-        graph, root=None, width=4.0, vert_gap=1.0, vert_loc=0, xcenter=0.5
-    ):
-        pos = {}  # dictionary to store node positions
-
-        def _hierarchy_pos(
-            G, root, width, vert_gap, vert_loc, xcenter, pos, parent=None, parsed=[]
-        ):
-            if root not in parsed:
-                parsed.append(root)
-                neighbors = list(G.neighbors(root))
-                if not neighbors:  # leaf node
-                    pos[root] = (xcenter, vert_loc)
-                else:
-                    dx = width / len(neighbors)
-                    nextx = xcenter - width / 2 - dx / 2
-                    for neighbor in neighbors:
-                        nextx += dx
-                        pos = _hierarchy_pos(
-                            G,
-                            neighbor,
-                            width=dx,
-                            vert_gap=vert_gap,
-                            vert_loc=vert_loc - vert_gap,
-                            xcenter=nextx,
-                            pos=pos,
-                            parent=root,
-                            parsed=parsed,
-                        )
-                pos[root] = (xcenter, vert_loc)
-            return pos
-
-        return _hierarchy_pos(graph, root, width, vert_gap, vert_loc, xcenter, pos)
-
-    root_id = id(root_node)
-    pos = hierarchical_layout(G, root=root_id)
-
-    # Draw nodes and edges
-    nx.draw(
-        G,
-        pos,
-        with_labels=False,
-        node_size=500,
-        node_color="#ADD8E6",
-        edge_color="#708090",
-        alpha=0.9,
-    )
+    # Top-down layout: children split their parent's width evenly, one level per row
+    stack: List[Tuple[Node, float, float, float]] = [(root_node, 0.5, 0.0, 4.0)]
+    while stack:
+        node, xcenter, vert_loc, width = stack.pop()
+        if node.op is not None:
+            labels.append(str(node.op))
+        elif node.value is not None:
+            labels.append(str(node.value))
+        else:
+            labels.append("None")
+        xs.append(xcenter)
+        ys.append(vert_loc)
+
+        children = [child for child in (node.left, node.right) if child is not None]
+        if not children:
+            continue
+
+        dx = width / len(children)
+        first_x = xcenter - width / 2 + dx / 2
+        # Push right to left so the left subtree is laid out first
+        for k in range(len(children) - 1, -1, -1):
+            child_x = first_x + k * dx
+            segments.append([(xcenter, vert_loc), (child_x, vert_loc - 1.0)])
+            stack.append((children[k], child_x, vert_loc - 1.0, dx))
+
+    # Draw all edges and nodes as one artist each
+    ax.add_collection(LineCollection(segments, colors="#708090", alpha=0.9, zorder=1))
+    ax.scatter(xs, ys, s=500, c="#ADD8E6", alpha=0.9, zorder=2)
 
     # Add labels
-    labels = {}
-    for n in nodes_list:
-        if n.op is not None:
-            labels[id(n)] = str(n.op)
-        elif n.value is not None:
-            labels[id(n)] = str(n.value)
-        else:
-            labels[id(n)] = "None"
+    for label, x, y in zip(labels, xs, ys):
+        ax.annotate(
+            label,
+            (x, y),
+            ha="center",
+            va="center",
+            fontsize=10,
+            color="#4B0082",
+            fontweight="bold",
+            zorder=3,
+        )
 
-    nx.draw_networkx_labels(
-        G, pos, labels, font_size=10, font_color="#4B0082", font_weight="bold"
-    )
-    plt.title("Expression Tree", fontsize=16, fontweight="bold")
-    plt.show()
+    ax.set_axis_off()
+    ax.set_title("Expression Tree", fontsize=16, fontweight="bold")
+    show_or_save(ax.figure, "expression_tree")  # type: ignore
 
 
 def plot_3d(
@@ -242,7 +282,7 @@ def plot_3d(
         ax.set_zlim(np.min(y) - margin, np.max(y) + margin)  # type: ignore
 
         plt.tight_layout()
-        plt.show()
+        show_or_save(fig, "data_3d")
 
 
 def plot_regression_data(
@@ -335,4 +375,4 @@ def plot_regression_data(
             raise ValueError(f"Unexpected input shape: {x.shape}")
 
     plt.tight_layout()
-    plt.show()
+    show_or_save(fig, "regression_data")